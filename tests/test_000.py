@@ -1,12 +1,7 @@
 # tests/test000.py
 
-import unittest
-from tlaloc_api_builder import builder
 
-class TestBuildApi(unittest.TestCase):
-    
-    def test_000(self):
-        return None
+def test_000():
+    from tlaloc_api_builder import builder
 
-if __name__ == "__main__":
-    unittest.main()
+    return None
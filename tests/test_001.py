@@ -0,0 +1,296 @@
+# tests/test_001.py
+
+import os
+import zipfile
+
+import pytest
+
+
+# Function to write a file, creating its parent directories
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+# Function to create a builder for a project in the given directory
+def make_builder(path, stage="prod"):
+    from tlaloc_api_builder import builder
+
+    os.makedirs(os.path.join(path, "API"), exist_ok=True)
+    return builder(
+        {
+            "path": str(path),
+            "name": "api",
+            "deployer": "tests",
+            "provider": "aws",
+            "aws_folder": "folder",
+            "version": "1.0.0",
+            "description": "Test API",
+            "title": "Test",
+            "aws_profile": "profile",
+            "aws_region": "us-east-1",
+            "aws_bucket": "bucket",
+            "aws_stage": stage,
+            "aws_stack": "stack",
+        }
+    )
+
+
+# Function to build the zip files of a project and return the methods
+def build_artifacts(api_builder):
+    api_builder.building = {}
+    api_builder._get_filetree()
+    api_builder._get_methods()
+    api_builder._make_temporal_tree()
+    api_builder._build_artifacts()
+    return api_builder.building["methods"]
+
+
+# Function to read the entries of the zip file of a method
+def read_zip(method):
+    path = os.path.join(method["path_temporal"], method["zip"])
+    with zipfile.ZipFile(path) as zip_file:
+        return {name: zip_file.read(name).decode() for name in zip_file.namelist()}
+
+
+def test_clean_mjs_nested_rules(tmp_path):
+    api_builder = make_builder(tmp_path / "project", stage="dev")
+    content = (
+        "a\n"
+        "//// IF aws_stage dev\n"
+        "b\n"
+        "//// IF aws_region eu-west-1\n"
+        "c\n"
+        "//// ENDIF\n"
+        "d\n"
+        "//// ENDIF\n"
+        "//// IF aws_stage prod\n"
+        "e\n"
+        "//// ENDIF\n"
+        "f\n"
+    )
+
+    assert api_builder._clean_mjs(content) == "a\nb\nd\nf\n"
+
+
+def test_clean_mjs_without_rules(tmp_path):
+    api_builder = make_builder(tmp_path / "project")
+    content = "export const handler = async () => ({});\n"
+
+    assert api_builder._clean_mjs(content) is content
+
+
+def test_clean_mjs_duplicate_rule(tmp_path):
+    api_builder = make_builder(tmp_path / "project")
+    content = "//// IF aws_stage prod\n//// IF aws_stage prod\n//// ENDIF\n//// ENDIF\n"
+
+    with pytest.raises(ValueError, match="Rule is already in use"):
+        api_builder._clean_mjs(content)
+
+
+def test_clean_mjs_stray_endif(tmp_path):
+    api_builder = make_builder(tmp_path / "project")
+
+    with pytest.raises(ValueError, match="No rule to close"):
+        api_builder._clean_mjs("a\n//// ENDIF\n")
+
+
+def test_get_filetree_method_paths(tmp_path):
+    path = tmp_path / "project"
+    write(str(path / "API" / "GET" / "index.mjs"), "")
+    write(str(path / "API" / "users" / "POST" / "index.mjs"), "")
+    write(str(path / "API" / "users" / "{id}" / "GET" / "index.mjs"), "")
+    write(str(path / "API" / "users" / "{id}" / "GET" / "POST" / "index.mjs"), "")
+    api_builder = make_builder(path)
+    api_builder.building = {}
+
+    api_builder._get_filetree()
+
+    sources = os.path.join(str(path), "API")
+    assert sorted(api_builder.building["method_paths"]) == sorted(
+        [
+            os.path.join(sources, "GET"),
+            os.path.join(sources, "users", "POST"),
+            os.path.join(sources, "users", "{id}", "GET"),
+        ]
+    )
+
+
+def test_get_filetree_invalid_method(tmp_path):
+    path = tmp_path / "project"
+    write(str(path / "API" / "users" / "FETCH" / "index.mjs"), "")
+    api_builder = make_builder(path)
+    api_builder.building = {}
+
+    with pytest.raises(ValueError, match="Invalid HTTP method: FETCH"):
+        api_builder._get_filetree()
+
+
+def test_build_artifacts(tmp_path):
+    path = tmp_path / "project"
+    method_path = path / "API" / "users" / "GET"
+    write(
+        str(method_path / "index.mjs"),
+        "a\n//// IF aws_stage dev\nb\n//// ENDIF\nc\n",
+    )
+    write(str(method_path / "util.mjs"), "export const x = 1;\n")
+    write(str(method_path / "data.txt"), "data\n")
+    write(str(method_path / ".env"), "SECRET=1\n")
+    api_builder = make_builder(path)
+
+    (method,) = build_artifacts(api_builder).values()
+
+    assert read_zip(method) == {
+        "data.txt": "data\n",
+        "index.mjs": "a\nc\n",
+        "util.mjs": "export const x = 1;\n",
+    }
+
+
+def test_build_artifacts_content_hash_ignores_mtimes(tmp_path):
+    path = tmp_path / "project"
+    index_path = str(path / "API" / "GET" / "index.mjs")
+    write(index_path, "export const handler = 1;\n")
+    api_builder = make_builder(path)
+    (method,) = build_artifacts(api_builder).values()
+
+    os.utime(index_path, (1_000_000_000, 1_000_000_000))
+    (rebuilt,) = build_artifacts(api_builder).values()
+
+    assert rebuilt["zip"] == method["zip"]
+    assert rebuilt["json"] == method["json"]
+
+
+def test_build_artifacts_content_hash_follows_cleaned_content(tmp_path):
+    path = tmp_path / "project"
+    index_path = str(path / "API" / "GET" / "index.mjs")
+    write(index_path, "a\n//// IF aws_stage dev\nb\n//// ENDIF\n")
+    api_builder = make_builder(path)
+    (method,) = build_artifacts(api_builder).values()
+
+    # A change dropped by the rules keeps the name
+    write(index_path, "a\n//// IF aws_stage dev\nc\n//// ENDIF\n")
+    (unchanged,) = build_artifacts(api_builder).values()
+
+    # A change kept by the rules renames the artifacts
+    write(index_path, "d\n//// IF aws_stage dev\nc\n//// ENDIF\n")
+    (changed,) = build_artifacts(api_builder).values()
+
+    assert unchanged["zip"] == method["zip"]
+    assert changed["zip"] != method["zip"]
+    assert changed["zip"].endswith(f"-{method['hash']}.zip")
+    assert changed["json"] == changed["zip"][: -len(".zip")] + ".json"
+
+
+def test_build_artifacts_keeps_utf8_sources(tmp_path):
+    path = tmp_path / "project"
+    index_path = str(path / "API" / "GET" / "index.mjs")
+    write(index_path, "")
+    with open(index_path, "wb") as f:
+        f.write("export const name = 'café';\n".encode("utf-8"))
+    api_builder = make_builder(path)
+
+    (method,) = build_artifacts(api_builder).values()
+
+    with zipfile.ZipFile(os.path.join(method["path_temporal"], method["zip"])) as z:
+        assert z.read("index.mjs") == "export const name = 'café';\n".encode("utf-8")
+
+
+def test_build_artifacts_reproducible_with_old_mtimes(tmp_path):
+    path = tmp_path / "project"
+    index_path = str(path / "API" / "GET" / "index.mjs")
+    write(index_path, "export const handler = 1;\n")
+    api_builder = make_builder(path)
+    (method,) = build_artifacts(api_builder).values()
+    with open(os.path.join(method["path_temporal"], method["zip"]), "rb") as f:
+        data = f.read()
+
+    os.utime(index_path, (0, 0))
+    (rebuilt,) = build_artifacts(api_builder).values()
+
+    with open(os.path.join(rebuilt["path_temporal"], rebuilt["zip"]), "rb") as f:
+        assert f.read() == data
+
+
+# S3 client double recording the uploads, with the HEAD answers given by key
+class StubS3:
+    def __init__(self, head_codes):
+        self.head_codes = head_codes
+        self.uploads = []
+
+    def head_object(self, Bucket, Key):
+        from botocore.exceptions import ClientError
+
+        code = self.head_codes.get(Key, "404")
+        if code is not None:
+            raise ClientError({"Error": {"Code": code}}, "HeadObject")
+        return {}
+
+    def upload_file(self, Filename, Bucket, Key, Config=None):
+        assert os.path.isfile(Filename)
+        self.uploads.append(Key)
+
+    def close(self):
+        pass
+
+
+# Function to build a single method project and upload it with a stub client
+# answering the HEAD request of the zip with the given code, None if found
+def upload_with_head_code(tmp_path, code):
+    path = tmp_path / "project"
+    write(str(path / "API" / "GET" / "index.mjs"), "export const handler = 1;\n")
+    api_builder = make_builder(path)
+    api_builder.build()
+    (method,) = api_builder.building["methods"].values()
+    s3_client = StubS3({f"API/{method['zip']}": code})
+    api_builder.__dict__["_aws_s3"] = s3_client
+    template = f"API/{api_builder.config['aws_template_file']}"
+    return api_builder, method, s3_client, template
+
+
+def test_upload_skips_existing_zip(tmp_path):
+    api_builder, method, s3_client, template = upload_with_head_code(tmp_path, None)
+
+    api_builder.upload()
+
+    assert sorted(s3_client.uploads) == sorted([f"API/{method['json']}", template])
+
+
+@pytest.mark.parametrize("code", ["404", "403"])
+def test_upload_missing_zip(tmp_path, code):
+    api_builder, method, s3_client, template = upload_with_head_code(tmp_path, code)
+
+    api_builder.upload()
+
+    assert sorted(s3_client.uploads) == sorted(
+        [f"API/{method['zip']}", f"API/{method['json']}", template]
+    )
+
+
+def test_upload_head_error(tmp_path):
+    from botocore.exceptions import ClientError
+
+    api_builder, method, s3_client, template = upload_with_head_code(tmp_path, "500")
+
+    with pytest.raises(ClientError):
+        api_builder.upload()
+    assert f"API/{method['zip']}" not in s3_client.uploads
+
+
+def test_write_json_same_output_without_orjson(tmp_path, monkeypatch):
+    pytest.importorskip("orjson")
+    import importlib
+
+    module = importlib.import_module("tlaloc_api_builder.builder")
+    api_builder = make_builder(tmp_path / "project")
+    data = {"b": [1, 2.5, {"name": "café"}], "a": {}, "c": [], "d": None}
+
+    api_builder._write_json(data, str(tmp_path / "orjson.json"))
+    monkeypatch.setattr(module, "orjson", None)
+    api_builder._write_json(data, str(tmp_path / "json.json"))
+
+    with open(tmp_path / "orjson.json", "rb") as f, open(
+        tmp_path / "json.json", "rb"
+    ) as g:
+        assert f.read() == g.read()
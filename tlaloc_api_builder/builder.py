@@ -1,11 +1,151 @@
 import os
 import json
-import copy
+import re
 import time
-import boto3
+import shutil
+import zipfile
+import hashlib
+import functools
+import logging
+import concurrent.futures
 
 from tlaloc_commons import commons
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# HTTP methods as a set for constant time membership checks
+_HTTP_METHODS = frozenset(commons.http_methods)
+
+# Hashing is pure, so the resource paths repeated across the templates are
+# hashed only once
+_get_hash = functools.lru_cache(maxsize=None)(commons.get_hash)
+
+# Body of the swagger comment of a method, found in a single scan
+_SWAGGER_RE = re.compile(r"/\*\* swagger[^\n]*(\n.*?)\n\*/", re.DOTALL)
+
+# Parts of the method template that are the same for every method, they are
+# shared between the templates and must not be modified
+_AWS_METHOD_PARAMETERS = {
+    "parGateway": {"Type": "String"},
+    "parResourceId": {"Type": "String"},
+}
+_AWS_LAMBDA_ASSUME_ROLE_POLICY = {
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Principal": {"Service": "lambda.amazonaws.com"},
+            "Action": "sts:AssumeRole",
+        }
+    ],
+}
+_AWS_LAMBDA_STATEMENTS = [
+    {
+        "Effect": "Allow",
+        "Action": [
+            "logs:CreateLogGroup",
+            "logs:CreateLogStream",
+            "logs:PutLogEvents",
+        ],
+        "Resource": "arn:aws:logs:*:*:*",
+    },
+    {
+        "Effect": "Allow",
+        "Action": [
+            "xray:PutTraceSegments",
+            "xray:PutTelemetryRecords",
+        ],
+        "Resource": "*",
+    },
+]
+_AWS_LAMBDA_MANAGED_POLICY_ARNS = [
+    "arn:aws:iam::aws:policy/CloudWatchLambdaInsightsExecutionRolePolicy"
+]
+
+# Invariant parts of the API template
+_AWS_STAGE_METHOD_SETTINGS = [
+    {
+        "DataTraceEnabled": True,
+        "HttpMethod": "*",
+        "LoggingLevel": "INFO",
+        "ResourcePath": "/*",
+    }
+]
+_AWS_API_OUTPUTS = {
+    "apiId": {
+        "Value": {"Ref": "apiGateway"},
+    },
+}
+
+# Mock responses of the CORS OPTIONS methods, the same for every resource
+_AWS_OPTIONS_METHOD_RESPONSES = [
+    {
+        "StatusCode": 200,
+        "ResponseParameters": {
+            "method.response.header.Access-Control-Allow-Origin": False,
+            "method.response.header.Access-Control-Allow-Methods": False,
+            "method.response.header.Access-Control-Allow-Headers": False,
+        },
+    }
+]
+_AWS_OPTIONS_INTEGRATION = {
+    "Type": "MOCK",
+    "RequestTemplates": {"application/json": '{"statusCode": 200}'},
+    "IntegrationResponses": [
+        {
+            "StatusCode": "200",
+            "ResponseParameters": {
+                "method.response.header.Access-Control-Allow-Origin": "'*'",
+                "method.response.header.Access-Control-Allow-Methods": "'*'",
+                "method.response.header.Access-Control-Allow-Headers": "'*'",
+            },
+            "ResponseTemplates": {"application/json": "{}"},
+        }
+    ],
+}
+
+# Fixed time of the zip entries, so the same contents give the same zip
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Concurrent S3 uploads, each one sending its multipart chunks concurrently
+_AWS_UPLOAD_WORKERS = 16
+_AWS_MULTIPART_SIZE = 8 * 1024 * 1024
+_AWS_MULTIPART_CONCURRENCY = 4
+
+# Connection pool large enough to serve every chunk of every upload at once
+_AWS_S3_MAX_POOL = _AWS_UPLOAD_WORKERS * _AWS_MULTIPART_CONCURRENCY
+
+# Error codes of a HEAD request on a key that is missing or can't be listed
+_AWS_S3_MISSING_CODES = frozenset(
+    ("404", "NoSuchKey", "NotFound", "403", "Forbidden", "AccessDenied")
+)
+
+
+def _get_string(config, key):
+    """
+    Get a required string parameter from the config
+
+    Parameters:
+        config (dict): The config dictionary
+        key (str): The name of the parameter
+
+    Returns:
+        str: The value of the parameter
+
+    Raises:
+        ValueError: If the parameter is not a non empty string
+    """
+
+    value = config.get(key)
+    if not value or not isinstance(value, str) or not value.strip():
+        raise ValueError(f"Config must have a non empty string parameter named {key}")
+    return value
+
 
 class builder:
     """
@@ -57,12 +197,12 @@ class builder:
             not config.get("path")
             or not isinstance(config["path"], str)
             or not config["path"].strip()
-            or not os.path.exists(config["path"])
+            or not os.path.isdir(config["path"])
         ):
             raise ValueError(
                 "Config must be a non empty string that corresponds to an existing path"
             )
-        if "API" not in os.listdir(config["path"]):
+        if not os.path.isdir(os.path.join(config["path"], "API")):
             raise ValueError('The path must contain a folder named "API"')
         self.config["path"] = config["path"]
         self.config["path_sources"] = os.path.join(self.config["path"], "API")
@@ -74,62 +214,15 @@ class builder:
             os.path.dirname(self.config["path"]), "docs"
         )
 
-        # Checking the config.name parameter
-        if (
-            not config.get("name")
-            or not isinstance(config["name"], str)
-            or not config["name"].strip()
-        ):
-            raise ValueError("Config must be a non empty string parameter name")
-        self.config["name"] = config["name"]
-
-        # Checking the deployer parameter
-        if (
-            not config.get("deployer")
-            or not isinstance(config["deployer"], str)
-            or not config["deployer"].strip()
-        ):
-            raise ValueError(
-                "Config must have a non empty string parameter named deployer"
-            )
-        self.config["deployer"] = config["deployer"]
+        # Checking the required string parameters
+        for key in ("name", "deployer", "provider", "aws_folder"):
+            self.config[key] = _get_string(config, key)
 
-        # Checking the provider parameter
-        if (
-            not config.get("provider")
-            or not isinstance(config["provider"], str)
-            or not config["provider"].strip()
-        ):
-            raise ValueError(
-                "Config must have a non empty string parameter named provider"
-            )
-        self.config["provider"] = config["provider"]
-
-        # Checking the aws_folder
-        if (
-            not config.get("aws_folder")
-            or not isinstance(config["aws_folder"], str)
-            or not config["aws_folder"].strip()
-        ):
-            raise ValueError(
-                "Config must have a non empty string parameter named aws_folder"
-            )
-        self.config["aws_folder"] = config["aws_folder"]
-
-        # Checking the version parameter
-        if config.get("version") and not isinstance(config["version"], str):
-            raise ValueError("Config must have a non empty string for version")
-        self.config["version"] = config["version"]
-
-        # Checking the description parameter
-        if config.get("description") and not isinstance(config["description"], str):
-            raise ValueError("Config must have a non empty string for description")
-        self.config["description"] = config["description"]
-
-        # Checking the title parameter
-        if config.get("title") and not isinstance(config["title"], str):
-            raise ValueError("Config must have a non empty string for title")
-        self.config["title"] = config["title"]
+        # Checking the optional string parameters
+        for key in ("version", "description", "title"):
+            if config.get(key) and not isinstance(config[key], str):
+                raise ValueError(f"Config must have a non empty string for {key}")
+            self.config[key] = config[key]
 
         # Storing timestamp
         self.config["timestamp"] = int(time.time())
@@ -137,61 +230,16 @@ class builder:
         # Checking the AWS deployment parameters ##################################
         if self.config["provider"] == "aws":
 
-            # Checking the aws_profile parameter
-            if (
-                not config.get("aws_profile")
-                or not isinstance(config["aws_profile"], str)
-                or not config["aws_profile"].strip()
-            ):
-                raise ValueError(
-                    "Config must be a non empty string parameter aws_profile"
-                )
-            self.config["aws_profile"] = config["aws_profile"]
-
-            # Checking the aws_region parameter
-            if (
-                not config.get("aws_region")
-                or not isinstance(config["aws_region"], str)
-                or not config["aws_region"].strip()
+            # Checking the AWS string parameters
+            for key in (
+                "aws_profile",
+                "aws_region",
+                "aws_bucket",
+                "aws_stage",
+                "aws_stack",
             ):
-                raise ValueError(
-                    "Config must be a non empty string parameter aws_region"
-                )
-            self.config["aws_region"] = config["aws_region"]
-
-            # Checking the aws_bucket parameter
-            if (
-                not config.get("aws_bucket")
-                or not isinstance(config["aws_bucket"], str)
-                or not config["aws_bucket"].strip()
-            ):
-                raise ValueError(
-                    "Config must be a non empty string parameter aws_bucket"
-                )
-            self.config["aws_bucket"] = config["aws_bucket"]
-
-            # Checking the aws_stage parameter
-            if (
-                not config.get("aws_stage")
-                or not isinstance(config["aws_stage"], str)
-                or not config["aws_stage"].strip()
-            ):
-                raise ValueError(
-                    "Config must be a non empty string parameter aws_stage"
-                )
-            self.config["aws_stage"] = config["aws_stage"]
-
-            # Checking the aws_stack parameter
-            if (
-                not config.get("aws_stack")
-                or not isinstance(config["aws_stack"], str)
-                or not config["aws_stack"].strip()
-            ):
-                raise ValueError(
-                    "Config must be a non empty string parameter aws_stack"
-                )
-            self.config["aws_stack"] = config["aws_stack"]
-            self.config["aws_stack_file"] = commons.get_hash(
+                self.config[key] = _get_string(config, key)
+            self.config["aws_stack_file"] = _get_hash(
                 f"{self.config["deployer"]}/{self.config["aws_stack"]}"
             )
 
@@ -217,60 +265,33 @@ class builder:
         self.building = {}
 
         # Reporting the configuration in use
-        print(
-            "Building API with config:\n    {}".format(
-                json.dumps(self.config, indent=4).replace("\n", "\n    ")
-            )
-        )
+        self._debug_json("Building API with config", self.config)
 
-        # Obtaining the file tree
+        # Obtaining the file tree and the method directories
         self._get_filetree()
-        print(
-            "File Tree:\n    {}".format(
-                json.dumps(self.building["filetree"], indent=4).replace("\n", "\n    ")
-            )
-        )
+        self._debug_json("File Tree", self.building["filetree"])
 
-        # API structure
-        self._get_structure()
-        print(
-            "API Structure:\n    {}".format(
-                json.dumps(self.building["structure"], indent=4).replace("\n", "\n    ")
-            )
-        )
-
-        # Generating swagger documentation
-        if swagger:
-            self._build_swagger()
-            print(
-                "Swagger Documentation:\n    {}".format(
-                    json.dumps(self.swagger, indent=4).replace("\n", "\n    ")
-                )
-            )
+        # API structure, only needed for the debug report
+        if logger.isEnabledFor(logging.DEBUG):
+            self._get_structure()
+            self._debug_json("API Structure", self.building["structure"])
 
         # Initialize methods dictionary
         self._get_methods()
-        print(
-            "API Methods Summary:\n    {}".format(
-                json.dumps(self.building["methods"], indent=4).replace("\n", "\n    ")
-            )
-        )
+        self._debug_json("API Methods Summary", self.building["methods"])
 
         # Making temporal tree for function zips
         print("Making temporal tree for lambda zips")
         self._make_temporal_tree()
 
-        # Copying files to temporal tree
-        print("Copying files to temporal tree")
-        self._copy_temporal_files()
-
-        # Preparing temporal files
-        print("Preparing temporal files")
-        self._prepare_temporal_files()
-
         # Creating the zip files
         print("Zipping the files")
-        self._zip_files()
+        self._build_artifacts()
+
+        # Generating swagger documentation
+        if swagger:
+            self._build_swagger()
+            self._debug_json("Swagger Documentation", self.swagger)
 
         if self.config["provider"] == "aws":
 
@@ -289,40 +310,88 @@ class builder:
         # Set the built flag to True
         self.built = True
 
-    def _get_filetree(self):
+    def _debug_json(self, title, data):
         """
-        Get the file tree from the API source files
+        Log a JSON dump of the data at debug level
 
         Parameters:
+            title (str): The title of the dump
+            data (dict): The data to dump
+
+        Returns:
             None
+        """
+
+        # Skip the serialization entirely when debug logging is disabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s:\n    %s",
+                title,
+                json.dumps(data, indent=4).replace("\n", "\n    "),
+            )
+
+    def _write_json(self, data, path):
+        """
+        Write the data to a JSON file with sorted keys, using orjson when available.
+        Both paths produce the same output: two space indentation and UTF-8
+        text
+
+        Parameters:
+            data (dict): The data to write
+            path (str): The path of the JSON file
 
         Returns:
             None
         """
 
-        # Initialize the filetree dictionary
-        filetree = {}
+        if orjson is not None:
+            with open(path, "wb") as f:
+                f.write(
+                    orjson.dumps(
+                        data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+                    )
+                )
+        else:
+            # json.dump writes many small chunks, so batch them in a large buffer
+            with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                json.dump(data, f, indent=2, sort_keys=True, ensure_ascii=False)
 
-        # Walk through the directory and build the filetree
-        for root, dirs, files in os.walk(self.config["path_sources"]):
+    def _run_parallel(self, function, items, max_workers=None):
+        """
+        Run a function for each item using a thread pool
 
-            # Create a nested dictionary for each directory
-            directory = filetree
-            for part in os.path.relpath(root, self.config["path_sources"]).split(
-                os.sep
-            ):
-                if part != ".":
-                    directory = directory.setdefault(part, {})
+        Parameters:
+            function (callable): The function to run for each item
+            items (iterable): The items to process
+            max_workers (int): The number of threads, the executor default if None
 
-            # Add files to the current directory
-            directory.update({file: None for file in files})
+        Returns:
+            None
 
-        # Store the filetree in the building dictionary
-        self.building["filetree"] = filetree
+        Raises:
+            Exception: The first exception raised by any of the calls
+        """
 
-    def _get_structure(self):
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+
+            # Submit the work and stop at the first failure
+            futures = [executor.submit(function, item) for item in items]
+            done, pending = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_EXCEPTION
+            )
+
+            # Cancel the work that has not started yet
+            for future in pending:
+                future.cancel()
+
+        # Propagate the first error, if any
+        for future in futures:
+            if future in done:
+                future.result()
+
+    def _get_filetree(self):
         """
-        Get the structure of the API from the filetree
+        Get the file tree and the method directories from the API source files
 
         Parameters:
             None
@@ -331,78 +400,103 @@ class builder:
             None
 
         Raises:
-            ValueError: If the filetree contains an invalid HTTP method
+            ValueError: If a directory without subdirectories is not named
+                after a valid HTTP method
         """
 
-        # Make a deep copy of the filetree
-        filetree_copy = copy.deepcopy(self.building["filetree"])
+        # Walk through the directories with an explicit stack, pushing the
+        # subdirectories in reverse so they are visited in listing order. Each
+        # item holds the filetree node, the path and the DirEntry of the
+        # directory (None for the sources root) and if it lies inside a method
+        filetree = {}
+        method_paths = []
+        pending = [(filetree, self.config["path_sources"], None, False)]
+        while pending:
+            directory, path, directory_entry, in_method = pending.pop()
+
+            # Keep the paths of the method directories, the directories inside
+            # a method belong to its sources and are never methods themselves
+            is_method = (
+                directory_entry is not None and directory_entry.name in _HTTP_METHODS
+            )
+            if is_method and not in_method:
+                method_paths.append(path)
+            in_method = in_method or is_method
+
+            # Add the entries of the directory to its filetree node
+            subdirectories = []
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        directory[entry.name] = {}
+                        subdirectories.append(
+                            (directory[entry.name], entry.path, entry, in_method)
+                        )
+                    else:
+                        directory[entry.name] = None
 
-        # Remove all the null values from the filetree
-        def remove_null_keys(d):
-            if not isinstance(d, dict):
-                return d
-            return {k: remove_null_keys(v) for k, v in d.items() if v is not None}
+            # Check that every directory without subdirectories is a method
+            if not subdirectories and directory_entry is not None and not is_method:
+                raise ValueError("Invalid HTTP method: {}".format(directory_entry.name))
 
-        filetree_copy = remove_null_keys(filetree_copy)
+            pending.extend(reversed(subdirectories))
 
-        # Check if all empty dictionaries in the filetree have a key that is a valid HTTP method
-        def check_http_methods(d):
-            if not isinstance(d, dict):
-                return
-            for k, v in d.items():
-                if not v:
-                    if k not in commons.http_methods:
-                        raise ValueError("Invalid HTTP method: {}".format(k))
-                else:
-                    check_http_methods(v)
+        # Store the filetree and the method paths in the building dictionary
+        self.building["filetree"] = filetree
+        self.building["method_paths"] = method_paths
+
+    def _get_structure(self):
+        """
+        Get the structure of the API from the filetree, already validated by
+        the filetree scan
 
-        check_http_methods(filetree_copy)
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        # Remove the files from the filetree with an explicit stack
+        structure = {}
+        pending = [(self.building["filetree"], structure)]
+        while pending:
+            directory, node = pending.pop()
+            for k, v in directory.items():
+                if v is None:
+                    continue
+                node[k] = {}
+                pending.append((v, node[k]))
 
         # Store the structure in the building dictionary
-        self.building["structure"] = filetree_copy
+        self.building["structure"] = structure
 
     def _build_swagger(self):
 
         from swagger_ui_bundle import swagger_ui_path
 
-        def _add_methods(structure, path):
-            methods = {}
-            for token in structure:
-                if token in commons.http_methods:
-                    with open(
-                        os.path.join(
-                            self.config["path_sources"],
-                            os.path.join(path, token),
-                            "index.mjs",
-                        )
-                    ) as f:
-                        content = f.read()
-                        start = content.find("/** swagger")
-                        start = content.find("\n", start)
-                        end = content.find("\n*/", start) + 1
-                        swagger_comment = content[start:end]
-                        if f"/{path}" not in methods:
-                            methods[f"/{path}"] = {}
-                        try:
-                            methods[f"/{path}"][token.lower()] = json.loads(
-                                swagger_comment
-                            )
-                        except:
-                            try:
-                                import yaml
-
-                                methods[f"/{path}"][token.lower()] = yaml.safe_load(
-                                    swagger_comment
-                                )
-                            except:
-                                raise ValueError(
-                                    "Invalid Swagger: json and yaml interpretation failed"
-                                )
-                else:
-                    methods = methods | _add_methods(
-                        structure[token], os.path.join(path, token)
+        # Assemble the paths from the swagger comments read while zipping
+        paths = {}
+        for method in self.building["methods"].values():
+            path = os.path.relpath(
+                os.path.dirname(method["path_sources"]), self.config["path_sources"]
+            )
+            if path == ".":
+                path = ""
+            operations = paths.setdefault(f"/{path}", {})
+            try:
+                operations[method["method"].lower()] = json.loads(method.get("swagger"))
+            except:
+                try:
+                    import yaml
+
+                    operations[method["method"].lower()] = yaml.safe_load(
+                        method.get("swagger")
+                    )
+                except:
+                    raise ValueError(
+                        "Invalid Swagger: json and yaml interpretation failed"
                     )
-            return methods
 
         # Initialize the swagger dictionary
         self.swagger = {
@@ -411,7 +505,7 @@ class builder:
                 "title": self.config["name"],
             },
             "schemes": ["https", "http"],
-            "paths": _add_methods(self.building["structure"], ""),
+            "paths": paths,
         }
         if "title" in self.config:
             self.swagger["info"]["title"] = self.config["title"]
@@ -420,24 +514,29 @@ class builder:
         if "description" in self.config:
             self.swagger["info"]["description"] = self.config["description"]
 
-        # Clear the docs directory
-        if os.path.exists(self.config["path_documentation"]):
-            os.system(f"rm -rf {self.config['path_documentation']}/*")
+        # Clear the docs directory, keeping its hidden entries (.git, .nojekyll)
+        if os.path.isdir(self.config["path_documentation"]):
+            with os.scandir(self.config["path_documentation"]) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.remove(entry.path)
         else:
             os.makedirs(self.config["path_documentation"])
 
         # Write the swagger file
-        json.dump(
+        self._write_json(
             self.swagger,
-            indent=4,
-            sort_keys=True,
-            fp=open(
-                os.path.join(self.config["path_documentation"], "swagger.json"), "w"
-            ),
+            os.path.join(self.config["path_documentation"], "swagger.json"),
         )
 
         # Copy the swagger ui files
-        os.system(f"cp -r {swagger_ui_path}/* {self.config["path_documentation"]}")
+        shutil.copytree(
+            swagger_ui_path, self.config["path_documentation"], dirs_exist_ok=True
+        )
 
         # Modify the initializer file
         index_html_path = os.path.join(
@@ -454,7 +553,7 @@ class builder:
 
     def _get_methods(self):
         """
-        Get the methods from the structure and prepares tje data structure
+        Get the methods found by the filetree scan and prepares the data structure
 
         Parameters:
             None
@@ -466,33 +565,24 @@ class builder:
         # Initialize the methods dictionary
         self.building["methods"] = {}
 
-        # Function to get the methods
-        def get_methods(d, path):
-            for token in d:
-                path_sources = os.path.join(path, token)
-                if token in commons.http_methods:
-                    method_hash = commons.get_hash(
-                        f"{self.config["deployer"]}-{self.config["aws_stack"]}-{path}/{token}"
-                    )
-                    last_change = int(os.path.getmtime(path_sources))
-                    self.building["methods"][method_hash] = {
-                        "hash": method_hash,
-                        "function_name": f"{self.config["deployer"]}-{self.config["name"]}-{method_hash}",
-                        "method": token,
-                        "zip": f"{last_change}-{method_hash}.zip",
-                        "json": f"{last_change}-{method_hash}.json",
-                        "path_sources": path_sources,
-                        "resource": "/".join(path_sources.split("/")[2:-1]),
-                        "path_temporal": os.path.join(
-                            self.config["path_temporal"], method_hash
-                        ),
-                    }
-
-                else:
-                    get_methods(d[token], path_sources)
-
-        # Get the methods from the structure
-        get_methods(self.building["structure"], self.config["path_sources"])
+        # Read the config values shared by every method once
+        prefix_hash = f"{self.config["deployer"]}-{self.config["aws_stack"]}"
+        prefix_function = f"{self.config["deployer"]}-{self.config["name"]}"
+        path_temporal = self.config["path_temporal"]
+
+        # Prepare the data of each method directory found by the filetree scan,
+        # the zip and json names are set once the zip content hash is known
+        for path_sources in self.building["method_paths"]:
+            token = os.path.basename(path_sources)
+            method_hash = _get_hash(f"{prefix_hash}-{path_sources}")
+            self.building["methods"][method_hash] = {
+                "hash": method_hash,
+                "function_name": f"{prefix_function}-{method_hash}",
+                "method": token,
+                "path_sources": path_sources,
+                "resource": "/".join(path_sources.split("/")[2:-1]),
+                "path_temporal": os.path.join(path_temporal, method_hash),
+            }
 
     def _make_temporal_tree(self):
         """
@@ -506,21 +596,22 @@ class builder:
         """
 
         # Remove the temporal directory if it exists
-        if os.path.exists(self.config["path_temporal"]):
-            os.system(f"rm -rf {self.config['path_temporal']}")
+        shutil.rmtree(self.config["path_temporal"], ignore_errors=True)
 
         # Create the temporal directory
         os.makedirs(self.config["path_temporal"])
 
         # Create the temporal directories for the methods
-        for method in self.building["methods"]:
-            os.makedirs(
-                self.building["methods"][method]["path_temporal"], exist_ok=True
-            )
+        for method in self.building["methods"].values():
+            os.makedirs(method["path_temporal"], exist_ok=True)
 
-    def _copy_temporal_files(self):
+    def _build_artifacts(self):
         """
-        Copy the files to the temporal directories for each method
+        Build the zip file for each method in a single pass over its sources,
+        applying the preparation rules to the mjs files and keeping the
+        swagger comment of the index file on the way. The zip and json files
+        are named after the hash of the zipped contents, so unchanged methods
+        keep their names between builds
 
         Parameters:
             None
@@ -528,94 +619,124 @@ class builder:
         Returns:
             None
         """
-        # Copy the files to the temporal directories for each method
-        for method in self.building["methods"]:
-            os.system(
-                f"cp -r {self.building["methods"][method]["path_sources"]}/* {self.building['methods'][method]['path_temporal']}"
-            )
 
-    def _prepare_temporal_files(self):
-        """
-        Prepare the temporal files for each method, executing the preparation rules
-
-        Parameters:
-            None
-
-        Returns:
-            None
-        """
+        # Function to add a source directory to the zip file of a method,
+        # feeding the names and contents of the files to the content hash.
+        # Hidden entries at the top of the method directory are left out and
+        # symlinked directories are not followed, as in the filetree scan
+        def add_directory(method, zip_file, content_hash, path, path_zip):
+            with os.scandir(path) as entries:
+                for entry in sorted(entries, key=lambda entry: entry.name):
+                    if not path_zip and entry.name.startswith("."):
+                        continue
+                    name = os.path.join(path_zip, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        add_directory(method, zip_file, content_hash, entry.path, name)
+                        continue
+                    if entry.is_dir():
+                        continue
+                    if entry.name.endswith(".mjs"):
+                        with open(entry.path, "r", encoding="utf-8") as f:
+                            content = f.read()
+                        if name == "index.mjs":
+                            method["swagger"] = self._extract_swagger(content)
+                        data = self._clean_mjs(content).encode("utf-8")
+                    else:
+                        with open(entry.path, "rb") as f:
+                            data = f.read()
+                    content_hash.update(f"{name}\0{len(data)}\0".encode())
+                    content_hash.update(data)
+                    zip_info = zipfile.ZipInfo.from_file(
+                        entry.path, name, strict_timestamps=False
+                    )
+                    zip_info.date_time = _ZIP_DATE_TIME
+                    zip_file.writestr(
+                        zip_info,
+                        data,
+                        compress_type=zipfile.ZIP_DEFLATED,
+                        compresslevel=1,
+                    )
 
-        # Apply preparation rules to the files
-        for method in self.building["methods"]:
+        # Function to build the zip file of a single method and name it and
+        # its template after the content hash
+        def build_artifact(method):
+            content_hash = hashlib.blake2b(digest_size=16)
+            path_zip = os.path.join(method["path_temporal"], f"{method["hash"]}.zip")
+            with zipfile.ZipFile(
+                path_zip, "w", zipfile.ZIP_DEFLATED, compresslevel=1
+            ) as zip_file:
+                add_directory(
+                    method, zip_file, content_hash, method["path_sources"], ""
+                )
+            prefix = f"{content_hash.hexdigest()}-{method["hash"]}"
+            method["zip"] = f"{prefix}.zip"
+            method["json"] = f"{prefix}.json"
+            os.replace(path_zip, os.path.join(method["path_temporal"], method["zip"]))
 
-            # for each file in the method directory
-            for root, dirs, files in os.walk(
-                self.building["methods"][method]["path_temporal"]
-            ):
-                for file in files:
-                    if file.endswith(".mjs"):
-                        self._clean_mjs(os.path.join(root, file))
+        # Build the zip file for each method
+        self._run_parallel(build_artifact, self.building["methods"].values())
 
-    def _clean_mjs(self, file_path):
+    def _extract_swagger(self, content):
         """
-        Clean the mjs file applying the comment rules
+        Extract the swagger comment from the mjs content
 
         Parameters:
-            None
+            content (str): The content of the mjs file
 
         Returns:
-            None
+            str: The body of the swagger comment, None if there is no comment
         """
 
-        # Initialize the file_clean string and the rules list
-        file_clean = ""
-        rules = []
+        match = _SWAGGER_RE.search(content)
+        if match is None:
+            return None
+        return match.group(1)
 
-        # Read the file and apply the rules
-        with open(file_path, "r") as f:
-            for line in f:
-                line_strip = line.strip()
-                if line_strip.startswith("//// IF"):
-                    line_split = line_strip.split(" ")
-                    rule = [line_split[2], "==", line_split[3]]
-                    if rule in rules:
-                        raise ValueError("Rule is already in use")
-                    rules.append(rule)
-                elif line_strip.startswith("//// ENDIF"):
-                    if len(rules) == 0:
-                        raise ValueError("No rule to close")
-                    rules.pop()
-                else:
-                    write = True
-                    for rule in rules:
-                        if rule[1] == "==" and self.config[rule[0]] == rule[2]:
-                            continue
-                        else:
-                            write = False
-                            break
-                    if write:
-                        file_clean += line
-
-        # Write the cleaned file
-        with open(file_path, "w") as f:
-            f.write(file_clean)
-
-    def _zip_files(self):
+    def _clean_mjs(self, content):
         """
-        Zip the files for each method
+        Clean the mjs content applying the comment rules
 
         Parameters:
-            None
+            content (str): The content of the mjs file
 
         Returns:
-            None
+            str: The cleaned content
+
+        Raises:
+            ValueError: If a rule is opened twice or closed without being opened
         """
 
-        # Zip the files for each method
-        for method in self.building["methods"]:
-            os.system(
-                f"cd {self.building['methods'][method]["path_temporal"]} && zip -r {self.building['methods'][method]['zip']} * >/dev/null 2>&1"
-            )
+        # Most files have no rules, those are kept untouched
+        if "//// IF" not in content and "//// ENDIF" not in content:
+            return content
+
+        # Initialize the kept lines, the open rules and the state stack, a
+        # line is kept only while all the open rules hold
+        lines = []
+        rules = []
+        states = []
+        active = True
+
+        # Apply the rules line by line
+        for line in content.splitlines(keepends=True):
+            line_strip = line.strip()
+            if line_strip.startswith("//// IF"):
+                line_split = line_strip.split(" ")
+                rule = (line_split[2], line_split[3])
+                if rule in rules:
+                    raise ValueError("Rule is already in use")
+                rules.append(rule)
+                states.append(active)
+                active = active and self.config[rule[0]] == rule[1]
+            elif line_strip.startswith("//// ENDIF"):
+                if len(rules) == 0:
+                    raise ValueError("No rule to close")
+                rules.pop()
+                active = states.pop()
+            elif active:
+                lines.append(line)
+
+        return "".join(lines)
 
     def _aws_extract_policies(self, filename):
 
@@ -667,132 +788,101 @@ class builder:
             None
         """
 
-        # Iterate over the methods
-        for method in self.building["methods"]:
+        # Build the template of each method
+        self._run_parallel(self._aws_build_method, self.building["methods"].values())
 
-            # Creating method short reference
-            method = self.building["methods"][method]
+    def _aws_build_method(self, method):
+        """
+        Make the template of a single method for AWS Cloudformation
 
-            # Extract the statements
-            policies = self._aws_extract_policies(
-                os.path.join(method["path_sources"], "index.mjs")
-            )
+        Parameters:
+            method (dict): The method data from the building dictionary
 
-            # Extract layers
-            layers, layers_policy = self._aws_extract_layers(
-                os.path.join(method["path_sources"], "index.mjs")
-            )
+        Returns:
+            None
+        """
 
-            # Create template object
-            method["template"] = {
-                "AWSTemplateFormatVersion": "2010-09-09",
-                "Parameters": {
-                    "parGateway": {"Type": "String"},
-                    "parResourceId": {"Type": "String"},
-                },
-                "Resources": {
-                    f"{method["hash"]}Method": {
-                        "Type": "AWS::ApiGateway::Method",
-                        "Properties": {
-                            "AuthorizationType": "NONE",
-                            "HttpMethod": method["method"],
-                            "ResourceId": {"Ref": "parResourceId"},
-                            "RestApiId": {"Ref": "parGateway"},
-                            "Integration": {
-                                "Type": "AWS_PROXY",
-                                "IntegrationHttpMethod": "POST",
-                                "Uri": {
-                                    "Fn::Sub": f"arn:aws:apigateway:${{AWS::Region}}:lambda:path/2015-03-31/functions/${{{method["hash"]}Function.Arn}}/invocations",
-                                },
+        # Extract the statements
+        policies = self._aws_extract_policies(
+            os.path.join(method["path_sources"], "index.mjs")
+        )
+
+        # Extract layers
+        layers, layers_policy = self._aws_extract_layers(
+            os.path.join(method["path_sources"], "index.mjs")
+        )
+
+        # Create template object
+        method["template"] = {
+            "AWSTemplateFormatVersion": "2010-09-09",
+            "Parameters": _AWS_METHOD_PARAMETERS,
+            "Resources": {
+                f"{method["hash"]}Method": {
+                    "Type": "AWS::ApiGateway::Method",
+                    "Properties": {
+                        "AuthorizationType": "NONE",
+                        "HttpMethod": method["method"],
+                        "ResourceId": {"Ref": "parResourceId"},
+                        "RestApiId": {"Ref": "parGateway"},
+                        "Integration": {
+                            "Type": "AWS_PROXY",
+                            "IntegrationHttpMethod": "POST",
+                            "Uri": {
+                                "Fn::Sub": f"arn:aws:apigateway:${{AWS::Region}}:lambda:path/2015-03-31/functions/${{{method["hash"]}Function.Arn}}/invocations",
                             },
                         },
                     },
-                    f"{method["hash"]}Role": {
-                        "Type": "AWS::IAM::Role",
-                        "Properties": {
-                            "AssumeRolePolicyDocument": {
-                                "Version": "2012-10-17",
-                                "Statement": [
-                                    {
-                                        "Effect": "Allow",
-                                        "Principal": {
-                                            "Service": "lambda.amazonaws.com"
-                                        },
-                                        "Action": "sts:AssumeRole",
-                                    }
-                                ],
-                            },
-                            "Policies": [
-                                {
-                                    "PolicyName": "LambdaExecutionPolicy",
-                                    "PolicyDocument": {
-                                        "Version": "2012-10-17",
-                                        "Statement": [
-                                            {
-                                                "Effect": "Allow",
-                                                "Action": [
-                                                    "logs:CreateLogGroup",
-                                                    "logs:CreateLogStream",
-                                                    "logs:PutLogEvents",
-                                                ],
-                                                "Resource": "arn:aws:logs:*:*:*",
-                                            },
-                                            {
-                                                "Effect": "Allow",
-                                                "Action": [
-                                                    "xray:PutTraceSegments",
-                                                    "xray:PutTelemetryRecords",
-                                                ],
-                                                "Resource": "*",
-                                            },
-                                        ]
-                                        + policies
-                                        + layers_policy,
-                                    },
-                                }
-                            ],
-                            "ManagedPolicyArns": [
-                                "arn:aws:iam::aws:policy/CloudWatchLambdaInsightsExecutionRolePolicy"
-                            ],
-                        },
+                },
+                f"{method["hash"]}Role": {
+                    "Type": "AWS::IAM::Role",
+                    "Properties": {
+                        "AssumeRolePolicyDocument": _AWS_LAMBDA_ASSUME_ROLE_POLICY,
+                        "Policies": [
+                            {
+                                "PolicyName": "LambdaExecutionPolicy",
+                                "PolicyDocument": {
+                                    "Version": "2012-10-17",
+                                    "Statement": _AWS_LAMBDA_STATEMENTS
+                                    + policies
+                                    + layers_policy,
+                                },
+                            }
+                        ],
+                        "ManagedPolicyArns": _AWS_LAMBDA_MANAGED_POLICY_ARNS,
                     },
-                    f"{method["hash"]}Function": {
-                        "Type": "AWS::Lambda::Function",
-                        "Properties": {
-                            "FunctionName": method["function_name"],
-                            "Handler": "index.handler",
-                            "Role": {"Fn::GetAtt": f"{method["hash"]}Role.Arn"},
-                            "Runtime": "nodejs20.x",
-                            "Timeout": 10,
-                            "MemorySize": 256,
-                            "TracingConfig": {"Mode": "Active"},
-                            "Layers": layers,
-                            "Code": {
-                                "S3Bucket": self.config["aws_bucket"],
-                                "S3Key": f"API/{method["zip"]}",
-                            },
+                },
+                f"{method["hash"]}Function": {
+                    "Type": "AWS::Lambda::Function",
+                    "Properties": {
+                        "FunctionName": method["function_name"],
+                        "Handler": "index.handler",
+                        "Role": {"Fn::GetAtt": f"{method["hash"]}Role.Arn"},
+                        "Runtime": "nodejs20.x",
+                        "Timeout": 10,
+                        "MemorySize": 256,
+                        "TracingConfig": {"Mode": "Active"},
+                        "Layers": layers,
+                        "Code": {
+                            "S3Bucket": self.config["aws_bucket"],
+                            "S3Key": f"API/{method["zip"]}",
                         },
                     },
-                    f"{method["hash"]}Invoke": {
-                        "Type": "AWS::Lambda::Permission",
-                        "Properties": {
-                            "Action": "lambda:InvokeFunction",
-                            "FunctionName": {
-                                "Fn::GetAtt": f"{method["hash"]}Function.Arn"
-                            },
-                            "Principal": "apigateway.amazonaws.com",
-                        },
+                },
+                f"{method["hash"]}Invoke": {
+                    "Type": "AWS::Lambda::Permission",
+                    "Properties": {
+                        "Action": "lambda:InvokeFunction",
+                        "FunctionName": {"Fn::GetAtt": f"{method["hash"]}Function.Arn"},
+                        "Principal": "apigateway.amazonaws.com",
                     },
                 },
-            }
+            },
+        }
 
-            # Create the template file
-            json.dump(
-                method["template"],
-                indent=4,
-                sort_keys=True,
-                fp=open(f"{method["path_temporal"]}/{method["json"]}", "w"),
-            )
+        # Create the template file
+        self._write_json(
+            method["template"], f"{method["path_temporal"]}/{method["json"]}"
+        )
 
     def _aws_build_apigateway(self):
         """
@@ -805,10 +895,15 @@ class builder:
             None
         """
 
+        # Creating methods short reference
+        methods = self.building["methods"].values()
+
         # Initialize the depends list
         dependence = ["apiGateway"]
-        for method in self.building["methods"]:
-            dependence.append(f"{self.building['methods'][method]['hash']}Stack")
+        dependence.extend(f"{method['hash']}Stack" for method in methods)
+
+        # The deployment is named after the timestamp to redeploy on every build
+        deployment = f"apiGatewayDeployment{self.config["timestamp"]}"
 
         template = {
             "AWSTemplateFormatVersion": "2010-09-09",
@@ -820,7 +915,7 @@ class builder:
                         "Parameters": {"EndpointConfiguration": "REGIONAL"},
                     },
                 },
-                f"apiGatewayDeployment{self.config["timestamp"]}": {
+                deployment: {
                     "Type": "AWS::ApiGateway::Deployment",
                     "Properties": {
                         "RestApiId": {"Ref": "apiGateway"},
@@ -831,59 +926,53 @@ class builder:
                     "Type": "AWS::ApiGateway::Stage",
                     "Properties": {
                         "RestApiId": {"Ref": "apiGateway"},
-                        "DeploymentId": {
-                            "Ref": f"apiGatewayDeployment{self.config["timestamp"]}"
-                        },
+                        "DeploymentId": {"Ref": deployment},
                         "TracingEnabled": True,
-                        "MethodSettings": [
-                            {
-                                "DataTraceEnabled": True,
-                                "HttpMethod": "*",
-                                "LoggingLevel": "INFO",
-                                "ResourcePath": "/*",
-                            }
-                        ],
+                        "MethodSettings": _AWS_STAGE_METHOD_SETTINGS,
                         "StageName": self.config["aws_stage"],
                     },
-                    "DependsOn": [f"apiGatewayDeployment{self.config["timestamp"]}"],
-                },
-            },
-            "Outputs": {
-                "apiId": {
-                    "Value": {"Ref": "apiGateway"},
+                    "DependsOn": [deployment],
                 },
             },
+            "Outputs": _AWS_API_OUTPUTS,
         }
 
         # Calculating the API resources
         resources_methods = {}
-        for method in self.building["methods"]:
+        for method in methods:
             # Adding the method to the resources list and adding the parent resource
-            if self.building["methods"][method]["resource"] not in resources_methods:
-                resources_methods[self.building["methods"][method]["resource"]] = []
-            resources_methods[self.building["methods"][method]["resource"]].append(
-                self.building["methods"][method]["method"]
+            resources_methods.setdefault(method["resource"], []).append(
+                method["method"]
             )
 
-        # Calculating all required resources paths
-        resources_all = []
+        # Calculating all required resources paths, once an ancestor is known
+        # all of its own ancestors are known as well
+        resources_all = set()
         for resource in resources_methods:
-            while len(resource) > 0:
-                if resource not in resources_all:
-                    resources_all.append(resource)
-                resource = "/".join(resource.split("/")[:-1])
+            parts = resource.split("/") if resource else []
+            for i in range(len(parts), 0, -1):
+                ancestor = "/".join(parts[:i])
+                if ancestor in resources_all:
+                    break
+                resources_all.add(ancestor)
+
+        # Calculating the resource hashes once for all the loops below
+        resource_hashes = {
+            resource: _get_hash(resource)
+            for resource in resources_all | resources_methods.keys()
+        }
 
         # Creating all required resources paths
         for resource in resources_all:
 
             # Calculating the resource hash
-            resource_hash = commons.get_hash(resource)
+            resource_hash = resource_hashes[resource]
 
             # Calculating the parent resource
             resource_parent = {"Fn::GetAtt": "apiGateway.RootResourceId"}
             if len(resource.split("/")) > 1:
                 resource_parent = {
-                    "Ref": f"{commons.get_hash('/'.join(resource.split('/')[:-1]))}Resource"
+                    "Ref": f"{resource_hashes['/'.join(resource.split('/')[:-1])]}Resource"
                 }
 
             # Adding the parent resource to the template
@@ -897,14 +986,14 @@ class builder:
             }
 
         # Creating the OPTION method for CORS
-        for resource in resources_methods:
+        for resource, resource_methods in resources_methods.items():
 
             # Checking to avoid overwriting options
-            if "OPTIONS" in resources_methods[resource]:
+            if "OPTIONS" in resource_methods:
                 continue
 
             # Calculating the resource hash
-            resource_hash = commons.get_hash(resource)
+            resource_hash = resource_hashes[resource]
             resource_id = resource_parent = {"Fn::GetAtt": "apiGateway.RootResourceId"}
             if len(resource) > 0:
                 resource_id = {"Ref": f"{resource_hash}Resource"}
@@ -917,50 +1006,26 @@ class builder:
                     "ResourceId": resource_id,
                     "HttpMethod": "OPTIONS",
                     "AuthorizationType": "NONE",
-                    "MethodResponses": [
-                        {
-                            "StatusCode": 200,
-                            "ResponseParameters": {
-                                "method.response.header.Access-Control-Allow-Origin": False,
-                                "method.response.header.Access-Control-Allow-Methods": False,
-                                "method.response.header.Access-Control-Allow-Headers": False,
-                            },
-                        }
-                    ],
-                    "Integration": {
-                        "Type": "MOCK",
-                        "RequestTemplates": {"application/json": '{"statusCode": 200}'},
-                        "IntegrationResponses": [
-                            {
-                                "StatusCode": "200",
-                                "ResponseParameters": {
-                                    "method.response.header.Access-Control-Allow-Origin": "'*'",
-                                    "method.response.header.Access-Control-Allow-Methods": "'*'",
-                                    "method.response.header.Access-Control-Allow-Headers": "'*'",
-                                },
-                                "ResponseTemplates": {"application/json": "{}"},
-                            }
-                        ],
-                    },
+                    "MethodResponses": _AWS_OPTIONS_METHOD_RESPONSES,
+                    "Integration": _AWS_OPTIONS_INTEGRATION,
                 },
             }
 
-        # Creating the methods
-        for method in self.building["methods"]:
+        # Creating the methods, with the templates stored under the same prefix
+        url_prefix = f"https://{self.config["aws_bucket"]}.s3.amazonaws.com/API/"
+        for method in methods:
 
-            resource = self.building["methods"][method]["resource"]
+            resource = method["resource"]
 
             # Calculating the parent resource
             resource_parent = {"Fn::GetAtt": "apiGateway.RootResourceId"}
             if len(resource) > 0:
-                resource_parent = {"Ref": f"{commons.get_hash(resource)}Resource"}
+                resource_parent = {"Ref": f"{resource_hashes[resource]}Resource"}
 
-            template["Resources"][
-                f"{self.building['methods'][method]['hash']}Stack"
-            ] = {
+            template["Resources"][f"{method['hash']}Stack"] = {
                 "Type": "AWS::CloudFormation::Stack",
                 "Properties": {
-                    "TemplateURL": f"https://{self.config["aws_bucket"]}.s3.amazonaws.com/API/{self.building['methods'][method]['json']}",
+                    "TemplateURL": url_prefix + method["json"],
                     "Parameters": {
                         "parGateway": {"Ref": "apiGateway"},
                         "parResourceId": resource_parent,
@@ -969,14 +1034,9 @@ class builder:
             }
 
         # Create the template file
-        json.dump(
+        self._write_json(
             template,
-            indent=4,
-            sort_keys=True,
-            fp=open(
-                f"{self.config["path_temporal"]}/{self.config["timestamp"]}-{self.config["aws_stack_file"]}-{self.config["aws_region"]}.json",
-                "w",
-            ),
+            f"{self.config["path_temporal"]}/{self.config["timestamp"]}-{self.config["aws_stack_file"]}-{self.config["aws_region"]}.json",
         )
         self.config["aws_template_file"] = (
             f"{self.config["timestamp"]}-{self.config["aws_stack_file"]}.json"
@@ -1019,43 +1079,62 @@ class builder:
             None
         """
 
-        # Create the aws session
-        self.aws = boto3.Session(profile_name=self.config["aws_profile"])
-
-        # Create the S3 client
-        s3_client = self.aws.client("s3", region_name=self.config["aws_region"])
+        # Import botocore only when AWS is actually used
+        import botocore.exceptions
+
+        # Get the shared S3 client and transfer settings
+        s3_client = self._aws_s3
+        transfer_config = self._aws_transfer_config
+
+        # Collect the zip and json files of every method, the zips are named
+        # after their content so an existing key already holds the same zip
+        uploads = []
+        for method in self.building["methods"].values():
+            for key in ("zip", "json"):
+                uploads.append(
+                    (
+                        os.path.join(method["path_temporal"], method[key]),
+                        f"API/{method[key]}",
+                        key == "zip",
+                    )
+                )
 
-        # For each method, upload the zip file to S3
-        for method in self.building["methods"]:
-            s3_client.upload_file(
-                os.path.join(
-                    self.building["methods"][method]["path_temporal"],
-                    self.building["methods"][method]["zip"],
-                ),
-                self.config["aws_bucket"],
-                f"API/{self.building["methods"][method]["zip"]}",
+        # Add the API template
+        uploads.append(
+            (
+                f"{self.config["path_temporal"]}/{self.config["timestamp"]}-{self.config["aws_stack_file"]}-{self.config["aws_region"]}.json",
+                f"API/{self.config["timestamp"]}-{self.config["aws_stack_file"]}.json",
+                False,
             )
+        )
+
+        # Function to check if a key already exists in the bucket. Without the
+        # s3:ListBucket permission a missing key answers 403 instead of 404, so
+        # both are taken as missing and the file is uploaded anyway
+        def exists(key):
+            try:
+                s3_client.head_object(Bucket=self.config["aws_bucket"], Key=key)
+            except botocore.exceptions.ClientError as error:
+                if error.response["Error"]["Code"] in _AWS_S3_MISSING_CODES:
+                    return False
+                raise
+            return True
+
+        # Function to upload a file to the bucket, skipping unchanged zips
+        def upload_file(upload):
+            path, key, skip_existing = upload
+            if skip_existing and exists(key):
+                return
             s3_client.upload_file(
-                os.path.join(
-                    self.building["methods"][method]["path_temporal"],
-                    self.building["methods"][method]["json"],
-                ),
-                self.config["aws_bucket"],
-                f"API/{self.building["methods"][method]["json"]}",
+                path, self.config["aws_bucket"], key, Config=transfer_config
             )
 
-        # Upload the API template to S3
-        s3_client.upload_file(
-            f"{self.config["path_temporal"]}/{self.config["timestamp"]}-{self.config["aws_stack_file"]}-{self.config["aws_region"]}.json",
-            self.config["aws_bucket"],
-            f"API/{self.config["timestamp"]}-{self.config["aws_stack_file"]}.json",
-        )
-
-        # Close the S3 client
-        s3_client.close()
-
-        # Delete the pointer to the aws session - No need to close it
-        del self.aws
+        # Upload the files concurrently through the shared client, releasing
+        # its connection pool once done
+        try:
+            self._run_parallel(upload_file, uploads, max_workers=_AWS_UPLOAD_WORKERS)
+        finally:
+            self._aws_close_s3()
 
     def deploy(self, wait=False):
         """
@@ -1096,8 +1175,8 @@ class builder:
         Returns:
             None
         """
-        # Create the aws session
-        self.aws = boto3.Session(profile_name=self.config["aws_profile"])
+        # Expose the shared aws session to the deployment helpers
+        self.aws = self._aws_session
 
         # Deploying cloudformation
         print("Deploying cloudformation")
@@ -1108,5 +1187,88 @@ class builder:
             print("Waiting for the deployment to finish")
             commons.aws.cloudformation.deploy_wait(self)
 
-        # Delete the pointer to the aws session - No need to close it
+        # Delete the pointer to the aws session - It is kept in the cache
         del self.aws
+
+        # Release the S3 connection pool if an upload left it open
+        self._aws_close_s3()
+
+    @functools.cached_property
+    def _aws_session(self):
+        """
+        AWS session shared by the upload and the deployment, created on first use
+
+        Returns:
+            boto3.Session: The AWS session for the configured profile
+        """
+
+        # Import boto3 only when AWS is actually used
+        import boto3
+
+        return boto3.Session(profile_name=self.config["aws_profile"])
+
+    @functools.cached_property
+    def _aws_s3(self):
+        """
+        S3 client reused across uploads, created on first use
+
+        Returns:
+            botocore.client.S3: The S3 client for the configured region
+        """
+
+        # Import botocore only when AWS is actually used
+        import botocore.config
+        import botocore.handlers
+
+        # Size the connection pool for the concurrent uploads and back off
+        # adaptively when S3 throttles them
+        s3_client = self._aws_session.client(
+            "s3",
+            region_name=self.config["aws_region"],
+            config=botocore.config.Config(
+                max_pool_connections=_AWS_S3_MAX_POOL,
+                retries={"max_attempts": 10, "mode": "adaptive"},
+            ),
+        )
+
+        # Send the bodies right away instead of waiting for a 100-continue
+        s3_client.meta.events.unregister(
+            "before-call.s3", botocore.handlers.add_expect_header
+        )
+
+        return s3_client
+
+    def _aws_close_s3(self):
+        """
+        Close the shared S3 client, if created, and drop it from the cache so
+        the next upload creates a new one
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        s3_client = self.__dict__.pop("_aws_s3", None)
+        if s3_client is not None:
+            s3_client.close()
+
+    @functools.cached_property
+    def _aws_transfer_config(self):
+        """
+        Transfer settings shared by the uploads, created on first use
+
+        Returns:
+            boto3.s3.transfer.TransferConfig: The multipart transfer settings
+        """
+
+        # Import boto3 only when AWS is actually used
+        import boto3.s3.transfer
+
+        return boto3.s3.transfer.TransferConfig(
+            multipart_threshold=_AWS_MULTIPART_SIZE,
+            multipart_chunksize=_AWS_MULTIPART_SIZE,
+            max_concurrency=_AWS_MULTIPART_CONCURRENCY,
+            use_threads=True,
+        )